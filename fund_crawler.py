@@ -6,15 +6,24 @@
 增加了更好的错误处理和备用数据源
 """
 
-import requests
+import asyncio
+import aiohttp
+import urllib3
+import numpy as np
 import pandas as pd
-import json
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import orjson
+import dbm
+import itertools
+import os
+import shelve
 import time
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+from _plot_setup import plt
 import logging
-from urllib.parse import quote
+from urllib.parse import quote, urlencode
 
 # 设置日志
 logging.basicConfig(
@@ -27,10 +36,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# 设置中文字体
-plt.rcParams['font.sans-serif'] = ['SimHei']  # 用来正常显示中文标签
-plt.rcParams['axes.unicode_minus'] = False   # 用来正常显示负号
-
 # 尝试导入akshare作为备用数据源
 try:
     import akshare as ak
@@ -40,18 +45,62 @@ except ImportError:
     AKSHARE_AVAILABLE = False
     logger.warning("akshare库不可用，请安装: pip install akshare")
 
+# 历史数据DataFrame的统一列顺序（各数据源返回格式一致）
+HISTORY_COLUMNS = ['date', 'net_value', 'cumulative_value', 'growth_rate']
+
+# 东方财富历史净值接口的固定查询参数，每次请求复制后再填入基金代码和日期
+# 回调名固定不变：服务端会把它写进JSONP响应体，变化的回调名会让ETag每次都不同
+_LSJZ_BASE_PARAMS = {'callback': 'jQuery18309441675404303797', 'pageIndex': 1, 'pageSize': 10000}
+
+# 只声明本机能解压的编码（安装了brotli时才包含br），否则压缩数据无法解析
+_ACCEPT_ENCODING = urllib3.util.make_headers(accept_encoding=True)['accept-encoding']
+
+# LSJZList中用到的字段（日期、单位净值、累计净值、日增长率），均以字符串返回
+_LSJZ_SCHEMA = pa.schema([
+    ('FSRQ', pa.string()),
+    ('DWJZ', pa.string()),
+    ('LJJZ', pa.string()),
+    ('JZZZL', pa.string()),
+])
+
+def _strip_jsonp(raw):
+    """
+    去掉JSONP回调包装，返回括号内的JSON bytes（只做一次切片）
+    """
+    start_idx = raw.find(b'(')
+    end_idx = raw.rfind(b')')
+    if start_idx == -1 or end_idx < start_idx:
+        return raw
+    return raw[start_idx + 1:end_idx]
+
+# ETag缓存文件固定放在模块目录下，超过保留期的条目在写入时清理
+# 缓存只供单个进程使用：shelve的部分后端（如dbm.dumb）没有文件锁，多进程同时写入会丢失条目
+ETAG_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.fund_etag_cache')
+ETAG_CACHE_MAX_AGE = 7 * 24 * 3600
+
 class FundCrawler:
     def __init__(self):
-        self.session = requests.Session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.8,en-US;q=0.5,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': _ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
-        self.session.headers.update(self.headers)
+        # 直接使用urllib3连接池，跨请求复用到各个域名的长连接
+        self.http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=16,
+            block=False,
+            headers=self.headers,
+            retries=urllib3.Retry(total=3, backoff_factor=0.3),
+        )
+        # 基本信息缓存: 基金代码 -> (写入时间, 结果)，60秒内重复查询直接返回
+        self._basic_cache = {}
+        self._basic_cache_ttl = 60
+        # 请求用的毫秒时间戳只在初始化时读取一次系统时钟，之后递增
+        self._ts = itertools.count(time.time_ns() // 1_000_000)
         # 创建logs目录
         import os
         os.makedirs('/home/leonfyang/workspace/project/logs', exist_ok=True)
@@ -60,27 +109,71 @@ class FundCrawler:
         """
         获取基金基本信息
         """
+        cached = self._basic_cache.get(fund_code)
+        if cached and time.monotonic() - cached[0] < self._basic_cache_ttl:
+            return cached[1]
+        
+        try:
+            info = self._fetch_basic_raw(fund_code)
+        except Exception as e:
+            print(f"获取基金 {fund_code} 基本信息失败: {e}")
+            return None
+        
+        self._basic_cache[fund_code] = (time.monotonic(), info)
+        return info
+    
+    def _fetch_basic_raw(self, fund_code):
+        """
+        从天天基金估值接口获取基金基本信息（不经过TTL缓存）
+        """
+        url = f"http://fundgz.1234567.com.cn/js/{fund_code}.js"
+        status, body = self._cached_get(url, timeout=urllib3.Timeout(connect=5, read=10))
+        return self._parse_basic_info(body)
+    
+    def get_many_basic_info(self, fund_codes):
+        """
+        并发获取多只基金基本信息，返回顺序与fund_codes一致
+        """
+        async def _gather():
+            connector = aiohttp.TCPConnector(limit=10)
+            timeout = aiohttp.ClientTimeout(total=10)
+            async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as session:
+                return await asyncio.gather(*[self._fetch_basic_async(session, code) for code in fund_codes])
+        
+        return asyncio.run(_gather())
+    
+    async def _fetch_basic_async(self, session, fund_code):
+        """
+        异步获取单只基金基本信息（复用同一个ClientSession）
+        """
         url = f"http://fundgz.1234567.com.cn/js/{fund_code}.js"
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.encoding = 'utf-8'
-            
-            # 提取JSON数据
-            json_str = response.text.replace('jsonpgz(', '').replace(');', '')
-            data = json.loads(json_str)
-            
-            return {
-                'code': data.get('fundcode'),
-                'name': data.get('name'),
-                'net_value': float(data.get('dwjz', 0)),
-                'estimate_value': float(data.get('gsz', 0)),
-                'estimate_growth_rate': float(data.get('gszzl', 0)),
-                'update_time': data.get('gztime')
-            }
+            async with session.get(url) as response:
+                body = await response.read()
+            info = self._parse_basic_info(body)
         except Exception as e:
             print(f"获取基金 {fund_code} 基本信息失败: {e}")
             return None
+        
+        # 写入TTL缓存，后续get_fund_basic_info可直接命中
+        self._basic_cache[fund_code] = (time.monotonic(), info)
+        return info
+    
+    def _parse_basic_info(self, body):
+        """
+        解析jsonpgz(...)格式的基金估值数据（body为原始bytes）
+        """
+        data = orjson.loads(_strip_jsonp(body))
+        
+        return {
+            'code': data.get('fundcode'),
+            'name': data.get('name'),
+            'net_value': float(data.get('dwjz', 0)),
+            'estimate_value': float(data.get('gsz', 0)),
+            'estimate_growth_rate': float(data.get('gszzl', 0)),
+            'update_time': data.get('gztime')
+        }
     
     def get_fund_history_data(self, fund_code, start_date=None, end_date=None):
         """
@@ -135,6 +228,11 @@ class FundCrawler:
             if df is not None and not df.empty:
                 logger.info(f"akshare获取到 {len(df)} 条原始数据，列名: {list(df.columns)}")
                 
+                # 先按日期筛选，再只对筛选后的行做类型转换（akshare的净值日期列为datetime.date）
+                start_day = datetime.strptime(start_date, '%Y-%m-%d').date()
+                end_day = datetime.strptime(end_date, '%Y-%m-%d').date()
+                df = df[(df['净值日期'] >= start_day) & (df['净值日期'] <= end_day)]
+                
                 # 转换列名为统一格式
                 df = df.rename(columns={
                     '净值日期': 'date',
@@ -143,19 +241,14 @@ class FundCrawler:
                 })
                 
                 # 数据类型转换
-                df['date'] = pd.to_datetime(df['date'])
+                df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', cache=True).astype('datetime64[ns]')
                 df['net_value'] = pd.to_numeric(df['net_value'], errors='coerce')
                 df['growth_rate'] = pd.to_numeric(df['growth_rate'], errors='coerce')
                 
                 # akshare数据没有累计净值，我们暂时设为与单位净值相同
                 df['cumulative_value'] = df['net_value']
                 
-                # 日期筛选
-                start_dt = pd.to_datetime(start_date)
-                end_dt = pd.to_datetime(end_date)
-                df = df[(df['date'] >= start_dt) & (df['date'] <= end_dt)]
-                
-                df = df.sort_values('date').reset_index(drop=True)
+                df = df[HISTORY_COLUMNS].sort_values('date').reset_index(drop=True)
                 logger.info(f"筛选后剩余 {len(df)} 条数据（{start_date} 至 {end_date}）")
                 return df
         except Exception as e:
@@ -167,71 +260,25 @@ class FundCrawler:
         使用东方财富新接口获取历史数据
         """
         url = "http://api.fund.eastmoney.com/f10/lsjz"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Referer': f'http://fund.eastmoney.com/{fund_code}.html',
-            'Accept': 'application/json, text/javascript, */*; q=0.01',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Connection': 'keep-alive',
-        }
-        
-        params = {
-            'callback': 'jQuery18309441675404303797_' + str(int(time.time() * 1000)),
-            'fundCode': fund_code,
-            'pageIndex': 1,
-            'pageSize': 10000,
-            'startDate': start_date,
-            'endDate': end_date,
-            '_': int(time.time() * 1000)
-        }
+        headers = self._eastmoney_headers(fund_code)
+        params = self._lsjz_params(fund_code, start_date, end_date)
         
         # 添加重试机制
         for attempt in range(3):
             try:
                 logger.info(f"东方财富新接口尝试第 {attempt + 1} 次")
-                response = self.session.get(url, params=params, headers=headers, timeout=20)
-                response.encoding = 'utf-8'
-                
-                logger.info(f"响应状态码: {response.status_code}")
-                logger.info(f"响应内容前100字符: {response.text[:100]}")
-                
-                if response.status_code != 200:
-                    continue
-                
-                # 提取JSON数据
-                json_str = response.text
-                start_idx = json_str.find('{')
-                end_idx = json_str.rfind('}') + 1
-                
-                if start_idx == -1 or end_idx == 0:
-                    logger.warning("响应中未找到JSON数据")
-                    continue
+                status, body = self._cached_get(url, params=params, headers=headers,
+                                                timeout=urllib3.Timeout(connect=5, read=15))
                 
-                json_data = json.loads(json_str[start_idx:end_idx])
-                logger.info(f"JSON解析结果: ErrCode={json_data.get('ErrCode')}, TotalCount={json_data.get('TotalCount')}")
+                logger.info(f"响应状态码: {status}")
+                logger.info(f"响应内容前100字符: {body[:100].decode('utf-8', errors='replace')}")
                 
-                if json_data.get('ErrCode') != 0:
-                    logger.warning(f"API返回错误: {json_data.get('ErrCode')} - {json_data.get('ErrMsg')}")
+                if status != 200:
                     continue
                 
-                if json_data.get('Data') and json_data['Data'].get('LSJZList'):
-                    data_list = []
-                    for item in json_data['Data']['LSJZList']:
-                        data_list.append({
-                            'date': item['FSRQ'],
-                            'net_value': float(item['DWJZ']) if item['DWJZ'] else 0,
-                            'cumulative_value': float(item['LJJZ']) if item['LJJZ'] else 0,
-                            'growth_rate': float(item['JZZZL']) if item['JZZZL'] else 0
-                        })
-                    
-                    if data_list:
-                        df = pd.DataFrame(data_list)
-                        df['date'] = pd.to_datetime(df['date'])
-                        df = df.sort_values('date').reset_index(drop=True)
-                        return df
-                else:
-                    logger.warning("API响应中没有数据")
+                df = self._parse_lsjz_body(body)
+                if df is not None:
+                    return df
                     
             except Exception as e:
                 logger.error(f"东方财富新接口第 {attempt + 1} 次尝试失败: {str(e)}")
@@ -240,6 +287,178 @@ class FundCrawler:
                     
         return None
     
+    def get_many_histories(self, fund_codes, start_date=None, end_date=None):
+        """
+        并发获取多只基金的历史净值数据（东方财富新接口）
+        返回 {基金代码: DataFrame或None}
+        """
+        if not start_date:
+            start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        if not end_date:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+        
+        async def _gather():
+            connector = aiohttp.TCPConnector(limit_per_host=4)
+            timeout = aiohttp.ClientTimeout(total=20)
+            async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as session:
+                return await asyncio.gather(
+                    *[self._history_async(session, code, start_date, end_date) for code in fund_codes]
+                )
+        
+        return dict(zip(fund_codes, asyncio.run(_gather())))
+    
+    async def _history_async(self, session, fund_code, start_date, end_date):
+        """
+        异步获取单只基金历史数据（参数与_get_history_from_eastmoney_new一致）
+        """
+        url = "http://api.fund.eastmoney.com/f10/lsjz"
+        
+        try:
+            async with session.get(url, params=self._lsjz_params(fund_code, start_date, end_date),
+                                   headers=self._eastmoney_headers(fund_code)) as response:
+                body = await response.read()
+            
+            if response.status != 200:
+                logger.warning(f"基金 {fund_code} 历史数据响应状态码: {response.status}")
+                return None
+            
+            return self._parse_lsjz_body(body)
+        except Exception as e:
+            logger.error(f"基金 {fund_code} 历史数据异步获取失败: {str(e)}")
+            return None
+    
+    def _eastmoney_headers(self, fund_code):
+        """
+        东方财富历史净值接口的请求头
+        """
+        return {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Referer': f'http://fund.eastmoney.com/{fund_code}.html',
+            'Accept': 'application/json, text/javascript, */*; q=0.01',
+            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+            'Accept-Encoding': _ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
+        }
+    
+    def _lsjz_params(self, fund_code, start_date, end_date):
+        """
+        东方财富历史净值接口的查询参数
+        """
+        token = next(self._ts)
+        params = _LSJZ_BASE_PARAMS.copy()
+        params['fundCode'] = fund_code
+        params['startDate'] = start_date
+        params['endDate'] = end_date
+        params['_'] = token
+        return params
+    
+    def _parse_lsjz_body(self, body):
+        """
+        解析东方财富历史净值接口的JSONP响应，无数据时返回None
+        """
+        try:
+            json_data = orjson.loads(_strip_jsonp(body))
+        except orjson.JSONDecodeError:
+            logger.warning("响应中未找到JSON数据")
+            return None
+        
+        logger.info(f"JSON解析结果: ErrCode={json_data.get('ErrCode')}, TotalCount={json_data.get('TotalCount')}")
+        
+        if json_data.get('ErrCode') != 0:
+            logger.warning(f"API返回错误: {json_data.get('ErrCode')} - {json_data.get('ErrMsg')}")
+            return None
+        
+        if json_data.get('Data') and json_data['Data'].get('LSJZList'):
+            return self._lsjz_to_frame(json_data['Data']['LSJZList'])
+        
+        logger.warning("API响应中没有数据")
+        return None
+    
+    def _lsjz_to_frame(self, lsjz_list):
+        """
+        将东方财富LSJZList经由PyArrow按列转换为DataFrame
+        接口按日期降序返回，直接反转为升序，无需再排序
+        """
+        table = pa.Table.from_pylist(lsjz_list, schema=_LSJZ_SCHEMA)
+        
+        def _to_float(column):
+            # 空值和空字符串按0处理
+            column = pc.fill_null(column, '0')
+            return pc.cast(pc.if_else(pc.equal(column, ''), '0', column), pa.float64())
+        
+        table = pa.table({
+            'date': pc.cast(table['FSRQ'], pa.date32()),
+            'net_value': _to_float(table['DWJZ']),
+            'cumulative_value': _to_float(table['LJJZ']),
+            'growth_rate': _to_float(table['JZZZL']),
+        }).take(np.arange(table.num_rows - 1, -1, -1))
+        
+        df = table.to_pandas(date_as_object=False)
+        # 与akshare数据源统一为纳秒精度的日期列
+        df['date'] = df['date'].astype('datetime64[ns]')
+        # 依赖接口的降序约定代替排序；顺序不符时再退回排序
+        if not df['date'].is_monotonic_increasing:
+            logger.warning("LSJZList未按日期降序返回，重新排序")
+            df = df.sort_values('date', ignore_index=True)
+        return df
+    
+    def _cached_get(self, url, params=None, headers=None, timeout=None):
+        """
+        带ETag缓存的GET请求，返回 (状态码, 响应体bytes)
+        命中304时返回缓存的响应体，状态码视为200
+        """
+        params = params or {}
+        # 去掉每次都会变化的时间戳和回调名，保证缓存能够命中
+        stable_params = {k: v for k, v in params.items() if k not in ('_', 'callback')}
+        cache_key = f"{url}?{urlencode(stable_params)}" if stable_params else url
+        cached = self._etag_cache_lookup(cache_key)
+        
+        request_headers = dict(headers if headers is not None else self.headers)
+        if cached:
+            request_headers['If-None-Match'] = cached[0]
+        
+        response = self.http.request('GET', url, fields=params or None, headers=request_headers, timeout=timeout)
+        
+        if response.status == 304 and cached:
+            logger.info(f"ETag未变化，使用本地缓存: {cache_key}")
+            return 200, cached[1]
+        
+        etag = response.headers.get('ETag')
+        if response.status == 200 and etag:
+            self._etag_cache_store(cache_key, etag, response.data)
+        
+        return response.status, response.data
+    
+    def _etag_cache_lookup(self, cache_key):
+        """
+        读取ETag缓存，返回 (etag, body) 或None
+        每次按需打开shelve文件，避免长期占用文件锁
+        """
+        try:
+            with shelve.open(ETAG_CACHE_PATH, flag='r') as db:
+                entry = db.get(cache_key)
+        except dbm.error:
+            # 缓存文件不存在或无法读取时直接发起普通请求
+            return None
+        
+        if entry and time.time() - entry[2] < ETAG_CACHE_MAX_AGE:
+            return entry[0], entry[1]
+        return None
+    
+    def _etag_cache_store(self, cache_key, etag, body):
+        """
+        写入ETag缓存: key -> (etag, body, 写入时间)，并清理过期条目
+        """
+        now = time.time()
+        try:
+            with shelve.open(ETAG_CACHE_PATH) as db:
+                expired = [key for key in db.keys() if now - db[key][2] >= ETAG_CACHE_MAX_AGE]
+                for key in expired:
+                    del db[key]
+                db[cache_key] = (etag, body, now)
+        except dbm.error as e:
+            logger.warning(f"ETag缓存写入失败: {str(e)}")
+    
     def _get_history_from_eastmoney_old(self, fund_code, start_date, end_date):
         """
         使用东方财富旧接口获取历史数据
@@ -257,17 +476,18 @@ class FundCrawler:
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Referer': f'http://fund.eastmoney.com/{fund_code}.html'
+            'Referer': f'http://fund.eastmoney.com/{fund_code}.html',
+            'Accept-Encoding': _ACCEPT_ENCODING,
         }
         
         try:
-            response = self.session.get(url, params=params, headers=headers, timeout=15)
-            response.encoding = 'utf-8'
+            response = self.http.request('GET', url, fields=params, headers=headers,
+                                         timeout=urllib3.Timeout(connect=5, read=15))
             
             # 这里需要根据实际响应格式解析数据
             # 由于接口格式可能变化，这里先返回None
-            logger.info(f"东方财富旧接口响应状态: {response.status_code}")
-            logger.info(f"响应内容前100字符: {response.text[:100]}")
+            logger.info(f"东方财富旧接口响应状态: {response.status}")
+            logger.info(f"响应内容前100字符: {response.data[:100].decode('utf-8', errors='replace')}")
             
         except Exception as e:
             logger.error(f"东方财富旧接口获取失败: {str(e)}")
@@ -282,9 +502,26 @@ class FundCrawler:
         logger.info("新浪财经接口暂未实现")
         return None
     
-    def plot_fund_trend(self, fund_code, days=365):
+    def save_history_csv(self, df, csv_filename):
+        """
+        使用pyarrow写出历史数据CSV（带UTF-8 BOM，方便Excel直接打开）
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # 日期列按 YYYY-MM-DD 输出，不带时间部分
+        date_idx = table.schema.get_field_index('date')
+        if date_idx != -1:
+            table = table.set_column(date_idx, 'date', pc.cast(table['date'], pa.date32()))
+        
+        with open(csv_filename, 'wb') as f:
+            # BOM和表头自行写出，保持与DataFrame.to_csv一致（pyarrow会给表头加引号）
+            f.write(b'\xef\xbb\xbf')
+            f.write((','.join(table.column_names) + '\n').encode('utf-8'))
+            pa_csv.write_csv(table, f, write_options=pa_csv.WriteOptions(include_header=False))
+    
+    def plot_fund_trend(self, fund_code, days=365, dpi=150, show=False):
         """
         绘制基金走势图
+        dpi: 保存图片的分辨率；show: 是否调用plt.show()显示图形
         """
         # 获取基金信息
         fund_info = self.get_fund_basic_info(fund_code)
@@ -301,7 +538,7 @@ class FundCrawler:
             return
         
         # 绘制走势图
-        plt.figure(figsize=(12, 8))
+        fig = plt.figure(figsize=(12, 8))
         
         # 净值走势
         plt.subplot(2, 1, 1)
@@ -314,7 +551,7 @@ class FundCrawler:
         
         # 涨跌幅走势
         plt.subplot(2, 1, 2)
-        colors = ['red' if x >= 0 else 'green' for x in df['growth_rate']]
+        colors = np.where(df['growth_rate'].to_numpy() >= 0, 'red', 'green')
         plt.bar(df['date'], df['growth_rate'], color=colors, alpha=0.7, width=1)
         plt.title('日涨跌幅', fontsize=12)
         plt.ylabel('涨跌幅 (%)')
@@ -322,8 +559,10 @@ class FundCrawler:
         plt.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig(f'{fund_code}_trend.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(f'{fund_code}_trend.png', dpi=dpi, bbox_inches='tight')
+        if show:
+            plt.show()
+        plt.close(fig)
         
         return df
 
@@ -331,6 +570,9 @@ def main():
     """
     示例用法
     """
+    # 脚本运行只保存图片不弹窗，使用非交互式后端；作为库导入时保留调用方的后端
+    plt.switch_backend('Agg')
+    
     crawler = FundCrawler()
     
     # 常见基金代码示例
@@ -347,8 +589,8 @@ def main():
     
     # 让用户选择基金或输入基金代码
     print("热门基金代码:")
-    for i, code in enumerate(popular_funds, 1):
-        info = crawler.get_fund_basic_info(code)
+    infos = crawler.get_many_basic_info(popular_funds)
+    for i, (code, info) in enumerate(zip(popular_funds, infos), 1):
         if info:
             print(f"{i}. {code} - {info['name']}")
     
@@ -387,7 +629,7 @@ def main():
             
             # 保存数据到CSV
             csv_filename = f"{fund_code}_data.csv"
-            df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
+            crawler.save_history_csv(df, csv_filename)
             print(f"历史数据已保存为: {csv_filename}")
 
 if __name__ == "__main__":
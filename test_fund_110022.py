@@ -56,7 +56,7 @@ def test_fund_110022():
             
             # 保存数据
             csv_file = f"test_{fund_code}_data.csv"
-            df.to_csv(csv_file, index=False, encoding='utf-8-sig')
+            crawler.save_history_csv(df, csv_file)
             print(f"  数据已保存至: {csv_file}")
             
             return True